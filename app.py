@@ -1,6 +1,8 @@
-from flask import Flask, jsonify, redirect
+from flask import Flask, jsonify, redirect, make_response
+from flask.json.provider import DefaultJSONProvider
 from flask_restful import Api, MethodNotAllowed, NotFound
 from flask_cors import CORS
+import orjson
 import os
 from resources.accountsResource import (
     CreateAccountResource, 
@@ -15,7 +17,9 @@ from resources.accountsResource import (
     AccountStatementPdfResource,
     MonthlyInterestResource,
     CloseAccountResource,
-    BlockAccountResource
+    BlockAccountResource,
+    BalanceSnapshotResource,
+    bootstrap_db
 )
 
 # ============================================
@@ -35,6 +39,32 @@ CORS(app)
 api = Api(app, prefix=PREFIX, catch_all_404s=True)
 
 
+# ============================================
+# JSON Serialization (orjson)
+# ============================================
+
+class OrjsonProvider(DefaultJSONProvider):
+    """Flask JSON provider (used by jsonify) backed by orjson."""
+
+    def dumps(self, obj, **kwargs):
+        return orjson.dumps(obj, option=orjson.OPT_NON_STR_KEYS).decode()
+
+    def loads(self, s, **kwargs):
+        return orjson.loads(s)
+
+
+app.json = OrjsonProvider(app)
+
+
+@api.representation('application/json')
+def output_json(data, code, headers=None):
+    """Serializes Flask-RESTful resource responses with orjson instead of the stdlib json module."""
+    response = make_response(orjson.dumps(data, option=orjson.OPT_NON_STR_KEYS), code)
+    response.headers.extend(headers or {})
+    response.mimetype = 'application/json'
+    return response
+
+
 # ============================================
 # Error Handler
 # ============================================
@@ -53,6 +83,12 @@ def handle_method_not_allowed_error(e):
     return response
 
 
+@app.before_request
+def ensure_database():
+    # Indexes and seed data are created on the first request; later calls return immediately
+    bootstrap_db()
+
+
 @app.route('/')
 def redirect_to_prefix():
     if PREFIX != '':
@@ -78,6 +114,7 @@ api.add_resource(AccountStatementPdfResource, '/accounts/statement/pdf/<int:id>'
 api.add_resource(MonthlyInterestResource, '/accounts/interest/<int:id>')
 api.add_resource(BlockAccountResource, '/accounts/block/<int:id>')
 api.add_resource(CloseAccountResource, '/accounts/close/<int:id>')
+api.add_resource(BalanceSnapshotResource, '/accounts/snapshots') # POST /accounts/snapshots (cron)
 
 
 
@@ -0,0 +1,110 @@
+import os
+
+import pytest
+
+# ============================================
+# Parallel Test Workers (pytest-xdist)
+# ============================================
+
+# Tests always run against a dedicated database (never the app's own, since _restore_db
+# rewrites every collection), and every xdist worker gets its own copy so accounts created
+# by tests on one worker never show up in another worker's listings. This has to happen
+# before the test module imports app, since the database handle is created at import time.
+_worker = os.environ.get("PYTEST_XDIST_WORKER")
+_test_database = os.environ.get("MONGO_TEST_DATABASE", "banking_test")
+os.environ["MONGO_DATABASE"] = f"{_test_database}_{_worker}" if _worker else _test_database
+
+
+# Optional so the suite still runs with xdist disabled (`pytest -p no:xdist`, e.g. under pdb)
+@pytest.hookimpl(optionalhook=True)
+def pytest_xdist_auto_num_workers(config):
+    """Sizes `-n auto` to the CPU count minus two, leaving cores for mongod and the OS."""
+    return max((os.cpu_count() or 1) - 2, 1)
+
+
+# ============================================
+# Shared Fixtures
+# ============================================
+
+@pytest.fixture(scope="session")
+def client():
+    """One Flask test client per worker, reused by every test."""
+    from app import app
+    app.testing = True
+    return app.test_client()
+
+
+@pytest.fixture(scope="session", autouse=True)
+def _seed():
+    """Seeds the worker's database with the initial accounts once per session (if it is empty)."""
+    from resources.accountsResource import seed_initial_accounts
+    seed_initial_accounts()
+
+
+@pytest.fixture(scope="session")
+def _db_snapshot(_seed, client):
+    """Creates the worker database's indexes once and captures its seeded contents."""
+    from resources.accountsResource import db, bootstrap_db
+    bootstrap_db()
+    return {name: list(db[name].find()) for name in db.list_collection_names()}
+
+
+@pytest.fixture(scope="session")
+def seeded_ids(_db_snapshot):
+    """
+    Ids of the active, funded accounts captured in the session snapshot, for tests that
+    only need an existing account. Changes made to them are undone by _restore_db.
+    """
+    return sorted(
+        account["id"] for account in _db_snapshot.get("accounts", [])
+        if account["status"] == "Active" and account["balance_cents"] > 0
+    )
+
+
+@pytest.fixture(autouse=True)
+def _restore_db(_db_snapshot):
+    """
+    Puts every collection back to the session snapshot after each test, so tests never
+    see each other's accounts and need no cleanup of their own. Documents are deleted
+    and reinserted rather than dropping collections, which keeps the indexes.
+    """
+    from resources.accountsResource import db
+    yield
+    for name in db.list_collection_names():
+        if name.startswith("system."):
+            continue
+        db[name].delete_many({})
+        if _db_snapshot.get(name):
+            db[name].insert_many(_db_snapshot[name])
+
+
+@pytest.fixture
+def make_account(client):
+    """Creates an account through the API with a single POST and returns its id."""
+
+    def _make(name, balance, no_of_months=12, address="Test Address"):
+        response = client.post('/accounts', json={
+            'name': name,
+            'balance': balance,
+            'no_of_months': no_of_months,
+            'address': address
+        })
+        assert response.status_code == 201, f"Setup Failed: Account POST returned {response.status_code}"
+        return response.get_json()['id']
+
+    return _make
+
+
+@pytest.fixture
+def make_account_with_history(client, make_account):
+    """Creates an account followed by a 100.00 deposit, for tests that need a transaction on record."""
+
+    def _make(name, balance, no_of_months=12, address="Test Address"):
+        # Both setup requests run in one client block, so their contexts are torn down together at the end
+        with client:
+            account_id = make_account(name, balance, no_of_months, address)
+            deposit_response = client.post('/accounts/deposit', json={'id': account_id, 'amount': 100.00})
+            assert deposit_response.status_code == 200, f"Setup Failed: Deposit POST returned {deposit_response.status_code}"
+            return account_id
+
+    return _make
@@ -0,0 +1,20 @@
+import multiprocessing
+import os
+
+# ============================================
+# Gunicorn Configuration (gunicorn -c gunicorn.conf.py)
+# ============================================
+
+wsgi_app = "app:app"
+bind = f"{os.environ.get('FLASK_DOMAIN', '0.0.0.0')}:{os.environ.get('FLASK_PORT', 5000)}"
+
+# Requests spend most of their time waiting on MongoDB, so each worker runs a pool of
+# threads that overlap those waits. The thread count matches the MongoClient pool size
+# so every thread can hold a socket without queueing for one.
+worker_class = "gthread"
+workers = int(os.environ.get("GUNICORN_WORKERS", multiprocessing.cpu_count()))
+threads = int(os.environ.get("MONGO_MAX_POOL_SIZE", 50))
+
+# Statement PDFs for long histories can take a while to render
+timeout = 60
+keepalive = 5
@@ -1,11 +1,24 @@
 from flask_restful import Resource
-from flask import request, Response
-from pymongo import MongoClient
-from datetime import datetime, UTC 
+from flask import request, send_file, Response, stream_with_context
+from pymongo import MongoClient, UpdateOne
+from pymongo.errors import OperationFailure
+import gridfs
+from datetime import datetime, timedelta, UTC 
 from bson.objectid import ObjectId # Import ObjectId for updating
+from bson.errors import InvalidId
 import os
-from reportlab.pdfgen import canvas
+import math
+import base64
+import orjson
+import threading
+import itertools
+import hashlib
+from functools import lru_cache
+from reportlab.lib import colors
 from reportlab.lib.pagesizes import letter
+from reportlab.lib.styles import ParagraphStyle
+from reportlab.platypus import SimpleDocTemplate, Paragraph, Spacer, Table, TableStyle, PageBreak
+from xml.sax.saxutils import escape
 from io import BytesIO
 
 # ============================================
@@ -13,107 +26,372 @@ from io import BytesIO
 # ============================================
 
 MONGO_URI = os.environ.get("MONGO_URI", "mongodb://localhost:27017/")
-DATABASE_NAME = "banking"
-client = None
-db = None
+DATABASE_NAME = os.environ.get("MONGO_DATABASE", "banking")
+# Pagination defaults for list endpoints
+DEFAULT_PAGE_SIZE = 50
+MAX_PAGE_SIZE = 200
+# Minimum age of an account's latest balance snapshot before a new one is taken
+SNAPSHOT_INTERVAL_HOURS = int(os.environ.get("SNAPSHOT_INTERVAL_HOURS", 24))
+# Snapshots are taken this far in the past, so transactions still being logged are not missed
+SNAPSHOT_SETTLE_SECONDS = int(os.environ.get("SNAPSHOT_SETTLE_SECONDS", 60))
+# Sockets per process; gunicorn.conf.py sizes its thread count from the same variable
+MONGO_MAX_POOL_SIZE = int(os.environ.get("MONGO_MAX_POOL_SIZE", 50))
+
+# The client connects lazily (connect=False) and pools sockets, so worker threads share
+# connections instead of each request racing to initialise the database handle.
+# tz_aware=True returns stored BSON dates as UTC-aware datetimes.
+client = MongoClient(MONGO_URI, maxPoolSize=MONGO_MAX_POOL_SIZE, minPoolSize=5, connect=False, retryWrites=True, tz_aware=True)
+db = client[DATABASE_NAME]
+# Rendered PDF statements, keyed by a hash of everything that appears in them
+statement_cache = gridfs.GridFS(db, collection="statement_cache")
+_bootstrap_lock = threading.Lock()
+# Server error code for operations (such as transactions) the deployment does not support
+ILLEGAL_OPERATION = 20
+# Server error code for writes rejected by a collection's validator (ACCOUNT_SCHEMA)
+DOCUMENT_VALIDATION_FAILURE = 121
+_bootstrapped = False
 
 # ============================================
 # MongoDB Setup and Helpers
 # ============================================
 
-def _get_statement_data(account_id):
-    db = get_mongo_db()
-    account = db.accounts.find_one({"id": account_id})
+# Sign applied to a transaction's amount by type. log_transaction writes the capitalised
+# forms; the lowercase ones are accepted for older documents.
+_SIGN = {'deposit': 1, 'Deposit': 1, 'withdraw': -1, 'Withdrawal': -1}
+# The same table as an aggregation expression over "$type"
+_SIGN_EXPR = {"$switch": {
+    "branches": [{"case": {"$eq": ["$type", type]}, "then": sign} for type, sign in _SIGN.items()],
+    "default": -1
+}}
+
+def _get_statement_data(account_id, start=None):
+    """
+    Builds statement data for an account. When a start timestamp is given, the
+    latest balance snapshot taken at or before it seeds the opening balance, so
+    only transactions after that snapshot are read. Transactions are returned as
+    a generator over the database cursor.
+    """
+    account = db.accounts.find_one({"id": account_id}, {**ACCOUNT_PROJECTION, "balance_cents": 1})
     if not account:
         return {"message": f"Account with id {account_id} not found"}, 404
+    balance_cents = account.pop("balance_cents")
 
-    transactions_cursor = db.transactions.find(
-        {"account_id": account_id}, 
-        {"_id": 0, "account_id": 0}
-    ).sort("timestamp", 1)
+    transaction_filter = {"account_id": account_id}
+    snapshot = None
+    if start is not None:
+        snapshot = db.balance_snapshots.find_one(
+            {"account_id": account_id, "as_of": {"$lte": start}},
+            sort=[("as_of", -1)]
+        )
+        if snapshot:
+            transaction_filter["timestamp"] = {"$gt": snapshot["as_of"]}
 
-    transactions = []
-    
-    # Fetch all transactions to calculate the running balance
-    temp_transactions = list(transactions_cursor)
-    
-    # Calculate total net transactions to find the opening balance
-    total_net_transaction_amount = sum(
-        t['amount'] if t['type'] == 'deposit' else -t['amount'] 
-        for t in temp_transactions
-    )
-    
-    opening_balance = round(account["balance"] - total_net_transaction_amount, 2)
-    current_running_balance = opening_balance
-    ISO_FORMAT_WITH_TZ = '%Y-%m-%dT%H:%M:%S.%f%z'
-    # Iterate forward to calculate and store the running balance for the statement
-    for t in temp_transactions:
-        if isinstance(t["timestamp"], str):
-            t["timestamp"] = datetime.strptime(t["timestamp"], '%Y-%m-%dT%H:%M:%S.%f%z')
-        t["timestamp"] = t["timestamp"].isoformat()
-        if t['type'] == 'deposit':
-            current_running_balance += t['amount']
-        else:
-            current_running_balance -= t['amount']
-        t['running_balance'] = round(current_running_balance, 2)
-        transactions.append(t)
+    if snapshot:
+        base_balance = snapshot["balance_cents"]
+    else:
+        # No snapshot: the balance before the first transaction is the current balance minus all of them
+        base_balance = {"$subtract": [balance_cents, "$total"]}
+
+    # MongoDB signs the amounts, computes the cumulative sum ("cum") and the total since the
+    # snapshot in timestamp order, and derives each running balance, so rows are streamed
+    # to the caller already computed. All sums are integer cents, so they are exact.
+    # Timestamps only keep milliseconds, so _id breaks ties: it is unique, and ObjectIds from
+    # one process increase in insertion order.
+    pipeline = [
+        {"$match": transaction_filter},
+        {"$sort": {"timestamp": 1, "_id": 1}},
+        # Only indexed fields are read, so the scan is answered from the index alone
+        {"$project": {"_id": 1, "timestamp": 1, "type": 1, "amount_cents": 1}},
+        {"$addFields": {"signed_amount": {"$multiply": ["$amount_cents", _SIGN_EXPR]}}},
+        {"$setWindowFields": {
+            "sortBy": {"timestamp": 1, "_id": 1},
+            "output": {
+                "cum": {"$sum": "$signed_amount", "window": {"documents": ["unbounded", "current"]}},
+                "total": {"$sum": "$signed_amount", "window": {"documents": ["unbounded", "unbounded"]}}
+            }
+        }},
+        {"$addFields": {"running_cents": {"$add": [base_balance, "$cum"]}}}
+    ]
+    if start is not None:
+        # Transactions between the snapshot and the statement start only move the opening balance
+        pipeline.append({"$match": {"timestamp": {"$gte": start}}})
+    pipeline.append({"$project": {
+        "_id": 0,
+        "type": 1,
+        "timestamp": 1,
+        "amount": {"$divide": ["$amount_cents", 100]},
+        "running_balance": {"$divide": ["$running_cents", 100]},
+        "opening_cents": {"$subtract": ["$running_cents", "$signed_amount"]}
+    }})
+    cursor = db.transactions.aggregate(pipeline)
+    first = next(cursor, None)
+
+    if first is None:
+        # Nothing happened since the start, so the balance then is the balance now
+        opening_balance = balance_cents
+    else:
+        opening_balance = first["opening_cents"]
+
+    def transactions():
+        if first is None:
+            return
+        for t in itertools.chain([first], cursor):
+            del t["opening_cents"]
+            t["timestamp"] = t["timestamp"].isoformat()
+            yield t
 
     return {
-        "account": format_account(account),
-        "transactions": transactions,
-        "opening_balance": opening_balance
+        "account": account,
+        "transactions": transactions(),
+        "opening_balance": from_cents(opening_balance)
     }, 200
 
-def get_mongo_db():
-    global client, db
-    if db is None:
+def _statement_cache_key(account_id, start=None):
+    """
+    Returns the PDF cache key for an account's statement, or None if the account
+    does not exist. The key changes whenever the account details, its balance or
+    its latest transaction change.
+    """
+    account = db.accounts.find_one({"id": account_id}, {"_id": 0, "name": 1, "balance_cents": 1})
+    if not account:
+        return None
+    # Served from the (account_id, timestamp, _id, ...) index walked backwards
+    latest = db.transactions.find_one({"account_id": account_id}, {"_id": 1}, sort=[("timestamp", -1), ("_id", -1)])
+    latest_id = latest["_id"] if latest else None
+    raw = f'{account_id}:{latest_id}:{account["balance_cents"]}:{account["name"]}:{start}'
+    return hashlib.sha256(raw.encode()).hexdigest()
+
+def _send_statement_pdf(pdf_file, account_id):
+    """Sends a PDF statement file object as a download."""
+    return send_file(
+        pdf_file,
+        mimetype='application/pdf',
+        as_attachment=True,
+        download_name=f'statement_{account_id}_{datetime.now(UTC).strftime("%Y%m%d")}.pdf'
+    )
+
+def _parse_pagination():
+    """
+    Reads ?page=, ?page_size= and ?cursor= for list endpoints. Raises ValueError
+    with a client-facing message if any of them are invalid. When a cursor is
+    given it takes precedence over page, avoiding skip's cost on deep pages.
+    """
+    try:
+        page = int(request.args.get("page", 1))
+        page_size = int(request.args.get("page_size", DEFAULT_PAGE_SIZE))
+    except ValueError:
+        raise ValueError("page and page_size must be integers")
+    if page < 1:
+        raise ValueError("page must be a positive integer")
+    if not 1 <= page_size <= MAX_PAGE_SIZE:
+        raise ValueError(f"page_size must be between 1 and {MAX_PAGE_SIZE}")
+    return page, page_size, request.args.get("cursor")
+
+def _encode_history_cursor(transaction):
+    """
+    Opaque, URL-safe cursor for the position after a transaction in history order. It holds
+    both the timestamp and the _id, since several transactions can share a millisecond.
+    """
+    raw = f'{transaction["timestamp"].isoformat()}|{transaction["_id"]}'.encode()
+    return base64.urlsafe_b64encode(raw).decode().rstrip("=")
+
+def _decode_history_cursor(cursor):
+    """Returns the (timestamp, _id) held by a history cursor. Raises ValueError if it is malformed."""
+    try:
+        raw = base64.urlsafe_b64decode(cursor + "=" * (-len(cursor) % 4)).decode()
+        timestamp, transaction_id = raw.split("|")
+        return datetime.fromisoformat(timestamp), ObjectId(transaction_id)
+    except InvalidId as e:
+        raise ValueError(str(e))
+
+def _parse_statement_start():
+    """Reads the optional ?start= ISO timestamp for statements, normalised to UTC. Raises ValueError if it is invalid."""
+    start = request.args.get("start")
+    if not start:
+        return None
+    start = datetime.fromisoformat(start)
+    if start.tzinfo is None:
+        start = start.replace(tzinfo=UTC)
+    try:
+        return start.astimezone(UTC)
+    except OverflowError:
+        # e.g. 0001-01-01T00:00:00+01:00, which is before the earliest representable datetime
+        raise ValueError("start is out of range")
+
+def bootstrap_db():
+    """Creates indexes and seeds the initial accounts once per process."""
+    global _bootstrapped
+    if _bootstrapped:
+        return
+    with _bootstrap_lock:
+        if _bootstrapped:
+            return
         try:
-            client = MongoClient(MONGO_URI) 
-            db = client[DATABASE_NAME]
             print(f"Connected to MongoDB database: {DATABASE_NAME}")
 
             # 1. Ensure indexes
             db.accounts.create_index("id", unique=True)
-            db.transactions.create_index("account_id")
-            
+            # Covers the statement pipeline and serves history (walked backwards) by prefix;
+            # _id follows timestamp as the tiebreak for transactions in the same millisecond
+            db.transactions.create_index([("account_id", 1), ("timestamp", 1), ("_id", 1), ("type", 1), ("amount_cents", 1)])
+            for superseded in ("account_id_1", "account_id_1_timestamp_-1", "account_id_1_timestamp_1_type_1_amount_cents_1"):
+                if superseded in db.transactions.index_information():
+                    db.transactions.drop_index(superseded)
+            db.balance_snapshots.create_index([("account_id", 1), ("as_of", -1)])
+            # Cached PDF statements are replaced and deleted by account
+            db["statement_cache.files"].create_index("account_id")
+
+            # 2. Bring documents written by older versions up to date (only migrations
+            # not yet recorded in the database run), then enforce the schema on writes
+            _run_migrations()
+            try:
+                db.command("collMod", "accounts", validator=ACCOUNT_SCHEMA)
+            except OperationFailure as e:
+                print(f"Could not apply accounts schema validation: {e}")
             
-            if db.accounts.count_documents({}) == 0:
-                print("Initializing database with dummy accounts...")
-                db.sequences.insert_one({"_id": "account_id", "sequence_value": 0}) 
-                initial_accounts = [
-                    # Added 'no_of_months' and 'address' for initial dummy accounts
-                    {"name": "Dheekshith B G", "balance": 1000.50, "status": "Active", "no_of_months": 12, "address": "123 Main St, Anytown"}, 
-                    {"name": "Ninad Agarwal", "balance": 500.00, "status": "Active", "no_of_months": 6, "address": "456 Oak Ave, Othercity"},
-                    {"name": "Mouneesh", "balance": 200.00, "status": "Active", "no_of_months": 24, "address": "789 Pine Ln, Somewhere"},
-                    {"name": "Mahith", "balance": 500.00, "status": "Active", "no_of_months": 25, "address": "789 Pine Ln, Somewhere"}
-                ]
-                
-                # Fetch the current sequence value and initialize if not exists
-                sequence_doc = db.sequences.find_one_and_update(
-                    {'_id': "account_id"}, 
-                    {'$inc': {'sequence_value': len(initial_accounts)}},
-                    upsert=True, 
-                    return_document=True
-                )
-                start_id = sequence_doc['sequence_value'] - len(initial_accounts)
-                
-                # Assign IDs and insert
-                for i, account in enumerate(initial_accounts):
-                    account['id'] = start_id + i + 1
-                    db.accounts.insert_one(account)
-                    
-                print(f"Inserted {len(initial_accounts)} initial accounts.")
+            seed_initial_accounts()
             
+            _bootstrapped = True
         except Exception as e:
             print(f"Error connecting to MongoDB: {e}")
-            client = None
-            db = None
-    return db
+
+
+def seed_initial_accounts():
+    """Inserts the dummy accounts if the accounts collection is empty; a no-op otherwise."""
+    try:
+        # The emptiness check, sequence bump and account inserts commit together or not at all.
+        # Two processes seeding at once conflict on the sequence, and the retried transaction
+        # then sees the other's accounts and skips seeding.
+        with client.start_session() as session:
+            session.with_transaction(_seed_initial_accounts)
+    except OperationFailure as e:
+        if e.code != ILLEGAL_OPERATION:
+            raise
+        # Standalone servers do not support transactions
+        print("Transactions are not supported by this MongoDB deployment; seeding without one.")
+        _seed_initial_accounts()
+
+def _seed_initial_accounts(session=None):
+    """Reserves ids for and inserts the dummy accounts if there are none, optionally inside a session's transaction."""
+    if db.accounts.count_documents({}, limit=1, session=session):
+        return
+    print("Initializing database with dummy accounts...")
+    initial_accounts = [
+        # Added 'no_of_months' and 'address' for initial dummy accounts
+        {"name": "Dheekshith B G", "balance_cents": 100050, "status": "Active", "no_of_months": 12, "address": "123 Main St, Anytown"}, 
+        {"name": "Ninad Agarwal", "balance_cents": 50000, "status": "Active", "no_of_months": 6, "address": "456 Oak Ave, Othercity"},
+        {"name": "Mouneesh", "balance_cents": 20000, "status": "Active", "no_of_months": 24, "address": "789 Pine Ln, Somewhere"},
+        {"name": "Mahith", "balance_cents": 50000, "status": "Active", "no_of_months": 25, "address": "789 Pine Ln, Somewhere"}
+    ]
+    
+    # Reserve a block of ids, initializing the sequence if it does not exist
+    sequence_doc = db.sequences.find_one_and_update(
+        {'_id': "account_id"}, 
+        {'$inc': {'sequence_value': len(initial_accounts)}},
+        upsert=True, 
+        return_document=True,
+        session=session
+    )
+    start_id = sequence_doc['sequence_value'] - len(initial_accounts)
+    
+    # Assign IDs and insert them in a single batch
+    for i, account in enumerate(initial_accounts):
+        account['id'] = start_id + i + 1
+    db.accounts.insert_many(initial_accounts, ordered=False, session=session)
+        
+    print(f"Inserted {len(initial_accounts)} initial accounts.")
+
+def _migrate_to_cents():
+    """Migration 1: stores amounts and balances as integer cents instead of floats."""
+    db.accounts.update_many(
+        {"balance": {"$exists": True}},
+        [{"$set": {"balance_cents": _to_cents_expr("$balance")}}, {"$unset": "balance"}]
+    )
+    db.transactions.update_many(
+        {"amount": {"$exists": True}},
+        [{"$set": {"amount_cents": _to_cents_expr("$amount")}}, {"$unset": "amount"}]
+    )
+    db.transactions.update_many(
+        {"balance_after": {"$exists": True}},
+        [{"$set": {"balance_after_cents": _to_cents_expr("$balance_after")}}, {"$unset": "balance_after"}]
+    )
+    db.balance_snapshots.update_many(
+        {"balance": {"$exists": True}},
+        [{"$set": {"balance_cents": _to_cents_expr("$balance")}}, {"$unset": "balance"}]
+    )
+
+def _migrate_timestamps_to_dates():
+    """Migration 2: stores ISO string timestamps as BSON dates."""
+    _migrate_string_dates(db.transactions, "timestamp")
+    _migrate_string_dates(db.balance_snapshots, "as_of")
+
+def _backfill_account_defaults():
+    """Migration 3: fills in fields required by ACCOUNT_SCHEMA on older accounts."""
+    db.accounts.update_many({"no_of_months": {"$exists": False}}, {"$set": {"no_of_months": 0}})
+    db.accounts.update_many({"address": {"$exists": False}}, {"$set": {"address": "N/A"}})
+
+def _backfill_balance_after():
+    """
+    Migration 4: records the resulting balance on transactions logged before it was stored.
+    Each one's balance is the account's current balance minus every later transaction.
+    """
+    for account_id in db.transactions.distinct("account_id", {"balance_after_cents": {"$exists": False}}):
+        account = db.accounts.find_one({"id": account_id}, {"balance_cents": 1})
+        if not account:
+            continue
+        rows = db.transactions.aggregate([
+            {"$match": {"account_id": account_id}},
+            {"$setWindowFields": {
+                "sortBy": {"timestamp": 1, "_id": 1},
+                "output": {"later_cents": {
+                    "$sum": {"$multiply": ["$amount_cents", _SIGN_EXPR]},
+                    "window": {"documents": [1, "unbounded"]}
+                }}
+            }},
+            {"$match": {"balance_after_cents": {"$exists": False}}},
+            {"$project": {"later_cents": 1}}
+        ])
+        updates = [
+            UpdateOne({"_id": row["_id"]}, {"$set": {"balance_after_cents": account["balance_cents"] - row["later_cents"]}})
+            for row in rows
+        ]
+        if updates:
+            db.transactions.bulk_write(updates, ordered=False)
+
+# Applied in order; the position in this list (starting at 1) is the migration's version.
+# Append new migrations to the end, never reorder or remove existing ones.
+MIGRATIONS = [
+    _migrate_to_cents,
+    _migrate_timestamps_to_dates,
+    _backfill_account_defaults,
+    _backfill_balance_after
+]
+
+def _run_migrations():
+    """
+    Runs the migrations newer than the version stored in the database, so each one scans
+    the collections once per database rather than on every process start. Migrations are
+    idempotent, so workers starting together may both run one without harm.
+    """
+    stored = db.schema_version.find_one({"_id": "schema"})
+    version = stored["version"] if stored else 0
+    for number, migration in enumerate(MIGRATIONS[version:], start=version + 1):
+        print(f"Running database migration {number}: {migration.__name__}")
+        migration()
+        db.schema_version.update_one({"_id": "schema"}, {"$max": {"version": number}}, upsert=True)
+
+def _migrate_string_dates(collection, field):
+    """Converts ISO 8601 string values of `field` to BSON dates."""
+    updates = [
+        UpdateOne({"_id": doc["_id"]}, {"$set": {field: datetime.fromisoformat(doc[field])}})
+        for doc in collection.find({field: {"$type": "string"}}, {field: 1})
+    ]
+    if updates:
+        collection.bulk_write(updates, ordered=False)
 
 
 def get_next_sequence(name):
     """Generates the next sequential ID for accounts."""
-    db = get_mongo_db()
     # Atomically increment the sequence value
     sequence_document = db.sequences.find_one_and_update(
         {'_id': name},
@@ -123,15 +401,71 @@ def get_next_sequence(name):
     )
     return sequence_document['sequence_value']
 
-def format_account(account):
-    """Formats a MongoDB account document for API response, ensuring new fields are present."""
-    # Remove MongoDB's internal ID
-    account.pop('_id', None) 
-    # Ensure all required fields exist, defaulting if missing
-    account['no_of_months'] = account.get('no_of_months', 0)
-    account['address'] = account.get('address', 'N/A')
-    
-    return account
+# Largest amount, in cents, accepted for a balance or transaction (100 billion). It keeps
+# values far inside BSON's 64-bit integers: encoding cannot overflow, and a balance would
+# need nearly a million maximum deposits before $inc could
+MAX_AMOUNT_CENTS = 10**13
+
+def to_cents(amount):
+    """
+    Converts a currency amount to integer cents, the unit balances are stored in. Raises
+    ValueError for infinite or NaN amounts (e.g. "inf" or 1e400), which have no cents value,
+    and for amounts beyond MAX_AMOUNT_CENTS (e.g. 1e300).
+    """
+    if not math.isfinite(amount):
+        raise ValueError("amount must be a finite number")
+    cents = int(round(amount * 100))
+    if abs(cents) > MAX_AMOUNT_CENTS:
+        raise ValueError("amount is too large")
+    return cents
+
+def from_cents(cents):
+    """Converts integer cents back to a currency amount for API responses."""
+    return cents / 100
+
+def validate_no_of_months(no_of_months):
+    """Raises ValueError with a client-facing message unless no_of_months is a non-negative integer."""
+    # bool is a subclass of int, but true/false are not month counts
+    if not isinstance(no_of_months, int) or isinstance(no_of_months, bool) or no_of_months < 0:
+        raise ValueError('no_of_months must be a non-negative integer')
+    return no_of_months
+
+def validate_address(address):
+    """Raises ValueError with a client-facing message unless address is a non-empty string."""
+    if not isinstance(address, str) or not address:
+        raise ValueError('address must be a non-empty string')
+    return address
+
+def _to_cents_expr(field):
+    """Aggregation expression converting a float currency field to integer cents."""
+    return {"$toLong": {"$round": [{"$multiply": [field, 100]}, 0]}}
+
+# Shapes account documents for API responses on the server, so reads need no Python formatting.
+# The schema validator guarantees every field is present.
+ACCOUNT_PROJECTION = {
+    "_id": 0,
+    "id": 1,
+    "name": 1,
+    "status": 1,
+    "no_of_months": 1,
+    "address": 1,
+    "created_at": 1,
+    "balance": {"$divide": ["$balance_cents", 100]}
+}
+
+ACCOUNT_SCHEMA = {
+    "$jsonSchema": {
+        "bsonType": "object",
+        "required": ["id", "name", "balance_cents", "status", "no_of_months", "address"],
+        "properties": {
+            "id": {"bsonType": ["int", "long"]},
+            "balance_cents": {"bsonType": ["int", "long"]},
+            "status": {"enum": ["Active", "Blocked", "Closed"]},
+            "no_of_months": {"bsonType": ["int", "long"], "minimum": 0},
+            "address": {"bsonType": "string"}
+        }
+    }
+}
 
 # ============================================
 # Resources
@@ -141,7 +475,6 @@ def format_account(account):
 class CreateAccountResource(Resource):
     """POST /accounts"""
     def post(self):
-        db = get_mongo_db()
         data = request.json
         
         # Validation
@@ -149,18 +482,21 @@ class CreateAccountResource(Resource):
             return {'message': 'Missing required fields: name and balance'}, 400
         
         try:
-            balance = float(data['balance'])
-            if balance < 0:
+            balance_cents = to_cents(float(data['balance']))
+            if balance_cents < 0:
                 return {'message': 'Balance cannot be negative'}, 400
-        except ValueError:
+        except (TypeError, ValueError):
             return {'message': 'Invalid balance format'}, 400
 
         # Assign default values for new fields if not provided, and validate
         no_of_months = data.get('no_of_months', 0)
         address = data.get('address', 'Address not specified')
         
-        if not isinstance(no_of_months, int) or no_of_months < 0:
-             return {'message': 'no_of_months must be a non-negative integer'}, 400
+        try:
+            validate_no_of_months(no_of_months)
+            validate_address(address)
+        except ValueError as e:
+            return {'message': str(e)}, 400
 
         # Get next sequential ID
         account_id = get_next_sequence("account_id")
@@ -169,41 +505,73 @@ class CreateAccountResource(Resource):
         initial_data = {
             "id": account_id,
             "name": data['name'],
-            "balance": balance,
+            "balance_cents": balance_cents,
             "status": "Active", # Default status
             "no_of_months": no_of_months, # New field
             "address": address, # New field
             "created_at": datetime.now(UTC).isoformat()
         }
         
-        db.accounts.insert_one(initial_data)
+        # Insert a copy so the generated _id is not added to the response
+        try:
+            db.accounts.insert_one(dict(initial_data))
+        except OperationFailure as e:
+            if e.code != DOCUMENT_VALIDATION_FAILURE:
+                raise
+            return {'message': 'Account data does not match the accounts schema'}, 400
         
-        # Respond with the created account data
-        return format_account(initial_data), 201
+        # Respond with the created account data, shaped like ACCOUNT_PROJECTION
+        initial_data["balance"] = from_cents(initial_data.pop("balance_cents"))
+        return initial_data, 201
 
 # 2. READ (All)
 class GetAccountsResource(Resource):
     """GET /accounts"""
     def get(self):
-        db = get_mongo_db()
-        accounts = list(db.accounts.find())
-        return [format_account(account) for account in accounts], 200
+        try:
+            page, page_size, cursor = _parse_pagination()
+        except ValueError as e:
+            return {'message': str(e)}, 400
+        try:
+            after_id = int(cursor) if cursor is not None else None
+        except ValueError:
+            return {'message': 'cursor must be an account id'}, 400
+
+        # Pages are ordered by id; a cursor (the last id of the previous page) avoids skip
+        if after_id is not None:
+            accounts = db.accounts.find({"id": {"$gt": after_id}}, ACCOUNT_PROJECTION)
+        else:
+            accounts = db.accounts.find({}, ACCOUNT_PROJECTION).skip((page - 1) * page_size)
+        accounts = accounts.sort("id", 1).limit(page_size).batch_size(page_size)
+
+        # Accounts are encoded one at a time as the cursor yields them, so memory stays
+        # bounded by the cursor batch instead of the whole page
+        def generate():
+            yield b'{"items":['
+            count, last_id = 0, None
+            for account in accounts:
+                if count:
+                    yield b','
+                yield orjson.dumps(account)
+                count, last_id = count + 1, account["id"]
+            next_cursor = last_id if count == page_size else None
+            yield b'],"next_cursor":' + orjson.dumps(next_cursor) + b'}'
+
+        return Response(stream_with_context(generate()), mimetype='application/json')
 
 # 3. READ (Single)
 class GetSingleAccountResource(Resource):
     """GET /accounts/<id>"""
     def get(self, id):
-        db = get_mongo_db()
-        account = db.accounts.find_one({"id": id})
+        account = db.accounts.find_one({"id": id}, ACCOUNT_PROJECTION)
         if account:
-            return format_account(account), 200
+            return account, 200
         return {'message': f'Account with id {id} not found'}, 404
 
 # 4. UPDATE
 class UpdateAccountResource(Resource):
     """PUT /accounts/<id>"""
     def put(self, id):
-        db = get_mongo_db()
         data = request.json
         
         update_fields = {}
@@ -216,29 +584,36 @@ class UpdateAccountResource(Resource):
         
         # Allow updating no_of_months (new field)
         if 'no_of_months' in data:
-            no_of_months = data['no_of_months']
-            if not isinstance(no_of_months, int) or no_of_months < 0:
-                return {'message': 'no_of_months must be a non-negative integer'}, 400
-            update_fields['no_of_months'] = no_of_months
+            try:
+                update_fields['no_of_months'] = validate_no_of_months(data['no_of_months'])
+            except ValueError as e:
+                return {'message': str(e)}, 400
             
         # Allow updating address (new field)
         if 'address' in data:
-            if not data['address']:
-                return {'message': 'Address cannot be empty'}, 400
-            update_fields['address'] = data['address']
+            try:
+                update_fields['address'] = validate_address(data['address'])
+            except ValueError as e:
+                return {'message': str(e)}, 400
             
         if not update_fields:
             return {'message': 'No valid fields provided for update (valid fields: name, no_of_months, address)'}, 400
 
         # Atomically update the account
-        result = db.accounts.find_one_and_update(
-            {"id": id},
-            {"$set": update_fields},
-            return_document=True
-        )
+        try:
+            result = db.accounts.find_one_and_update(
+                {"id": id},
+                {"$set": update_fields},
+                projection=ACCOUNT_PROJECTION,
+                return_document=True
+            )
+        except OperationFailure as e:
+            if e.code != DOCUMENT_VALIDATION_FAILURE:
+                raise
+            return {'message': 'Account data does not match the accounts schema'}, 400
         
         if result:
-            return format_account(result), 200
+            return result, 200
         
         return {'message': f'Account with id {id} not found'}, 404
 
@@ -246,20 +621,21 @@ class UpdateAccountResource(Resource):
 class DeleteAccountResource(Resource):
     """DELETE /accounts/<id>"""
     def delete(self, id):
-        db = get_mongo_db()
-        
         account = db.accounts.find_one({"id": id})
         if not account:
             return {'message': f'Account with id {id} not found'}, 404
 
         # Business Requirement: Balance must be zero to delete
-        if account.get("balance", 0) != 0:
+        if account.get("balance_cents", 0) != 0:
             return {"message": "Account must have a zero balance before deletion.", 
-                    "current_balance": account["balance"]}, 400
+                    "current_balance": from_cents(account["balance_cents"])}, 400
         
         # Delete account and associated transactions
         db.accounts.delete_one({"id": id})
         db.transactions.delete_many({"account_id": id})
+        db.balance_snapshots.delete_many({"account_id": id})
+        for cached in statement_cache.find({"account_id": id}):
+            statement_cache.delete(cached._id)
         
         return {'message': f'Account with id {id} and all related transactions deleted'}, 200
 
@@ -268,21 +644,30 @@ class DeleteAccountResource(Resource):
 # ============================================
 
 # Utility function for transaction logging
-def log_transaction(db, account_id, type, amount):
-    """Logs a transaction in the transactions collection."""
+def log_transaction(db, account_id, type, amount_cents, balance_after_cents):
+    """Logs a transaction in the transactions collection, along with the resulting balance (in cents)."""
     transaction_data = {
         "account_id": account_id,
         "type": type,
-        "amount": amount,
-        "timestamp": datetime.now(UTC).isoformat()
+        "amount_cents": amount_cents,
+        "balance_after_cents": balance_after_cents,
+        "timestamp": datetime.now(UTC)
     }
     db.transactions.insert_one(transaction_data)
 
+def format_transaction(transaction):
+    """Formats a MongoDB transaction document for API response."""
+    transaction.pop('_id', None)
+    transaction['amount'] = from_cents(transaction.pop('amount_cents'))
+    transaction['timestamp'] = transaction['timestamp'].isoformat()
+    if 'balance_after_cents' in transaction:
+        transaction['balance_after'] = from_cents(transaction.pop('balance_after_cents'))
+    return transaction
+
 # Deposit
 class DepositMoneyResource(Resource):
     """POST /accounts/deposit"""
     def post(self):
-        db = get_mongo_db()
         data = request.json
         
         if 'id' not in data or 'amount' not in data:
@@ -290,22 +675,23 @@ class DepositMoneyResource(Resource):
         
         try:
             account_id = int(data['id'])
-            amount = float(data['amount'])
-            if amount <= 0:
+            amount_cents = to_cents(float(data['amount']))
+            if amount_cents <= 0:
                 return {'message': 'Deposit amount must be positive'}, 400
-        except ValueError:
+        except (TypeError, ValueError):
             return {'message': 'Invalid id or amount format'}, 400
             
         # Atomically update the balance and check account status
         result = db.accounts.find_one_and_update(
             {"id": account_id, "status": "Active"}, # Only update Active accounts
-            {"$inc": {"balance": amount}},
+            {"$inc": {"balance_cents": amount_cents}},
+            projection={**ACCOUNT_PROJECTION, "balance_cents": 1},
             return_document=True
         )
         
         if result:
-            log_transaction(db, account_id, "Deposit", amount)
-            return format_account(result), 200
+            log_transaction(db, account_id, "Deposit", amount_cents, result.pop("balance_cents"))
+            return result, 200
         
         # Check why update failed (not found or not active)
         account_check = db.accounts.find_one({"id": account_id})
@@ -319,7 +705,6 @@ class DepositMoneyResource(Resource):
 class WithdrawMoneyResource(Resource):
     """POST /accounts/withdraw"""
     def post(self):
-        db = get_mongo_db()
         data = request.json
         
         if 'id' not in data or 'amount' not in data:
@@ -327,43 +712,39 @@ class WithdrawMoneyResource(Resource):
             
         try:
             account_id = int(data['id'])
-            amount = float(data['amount'])
-            if amount <= 0:
+            amount_cents = to_cents(float(data['amount']))
+            if amount_cents <= 0:
                 return {'message': 'Withdrawal amount must be positive'}, 400
-        except ValueError:
+        except (TypeError, ValueError):
             return {'message': 'Invalid id or amount format'}, 400
             
-        # 1. Find the account and check status/balance
-        account = db.accounts.find_one({"id": account_id})
-        if not account:
-            return {'message': f'Account with id {account_id} not found'}, 404
-        
-        if account.get("status") != "Active":
-            return {'message': f"Cannot withdraw from account status: {account['status']}"}, 400
-            
-        if account.get("balance", 0) < amount:
-            return {'message': 'Insufficient balance'}, 400
-            
-        # 2. Atomically update the balance
+        # Atomically check status/balance and update in one round-trip, so two concurrent
+        # withdrawals cannot both pass the balance check
         result = db.accounts.find_one_and_update(
-            {"id": account_id},
-            {"$inc": {"balance": -amount}}, # Subtract amount
+            {"id": account_id, "status": "Active", "balance_cents": {"$gte": amount_cents}},
+            {"$inc": {"balance_cents": -amount_cents}}, # Subtract amount
+            projection={**ACCOUNT_PROJECTION, "balance_cents": 1},
             return_document=True
         )
         
         if result:
-            log_transaction(db, account_id, "Withdrawal", amount)
-            return format_account(result), 200
+            log_transaction(db, account_id, "Withdrawal", amount_cents, result.pop("balance_cents"))
+            return result, 200
         
-        # Should ideally not be reached if checks above passed, but good for safety
-        return {'message': 'Withdrawal failed due to an unknown error'}, 500
+        # Check why update failed (not found, not active or insufficient balance)
+        account_check = db.accounts.find_one({"id": account_id})
+        if not account_check:
+            return {'message': f'Account with id {account_id} not found'}, 404
+        
+        if account_check.get("status") != "Active":
+            return {'message': f"Cannot withdraw from account status: {account_check['status']}"}, 400
+            
+        return {'message': 'Insufficient balance'}, 400
 
 # Transaction History
 class TransactionHistoryResource(Resource):
     """GET /accounts/<id>/transactions"""
     def get(self, id):
-        db = get_mongo_db()
-        
         try:
             account_id = int(id)
         except ValueError:
@@ -373,28 +754,46 @@ class TransactionHistoryResource(Resource):
         if not db.accounts.find_one({"id": account_id}):
             return {'message': f'Account with id {account_id} not found'}, 404
             
-        transactions = list(db.transactions.find({"account_id": account_id}, {'_id': 0}))
-        
-        # Sort by timestamp (most recent first)
-        transactions.sort(key=lambda x: x['timestamp'], reverse=True)
+        try:
+            page, page_size, cursor = _parse_pagination()
+        except ValueError as e:
+            return {'message': str(e)}, 400
+        try:
+            before = _decode_history_cursor(cursor) if cursor is not None else None
+        except ValueError:
+            return {'message': 'Invalid cursor'}, 400
+
+        # Sorted (most recent first) and paginated by MongoDB using the (account_id, timestamp, _id)
+        # index; a cursor (the last row of the previous page) avoids skip
+        transaction_filter = {"account_id": account_id}
+        if before is not None:
+            before_timestamp, before_id = before
+            transaction_filter["$or"] = [
+                {"timestamp": {"$lt": before_timestamp}},
+                {"timestamp": before_timestamp, "_id": {"$lt": before_id}}
+            ]
+        transactions_cursor = db.transactions.find(transaction_filter).sort([("timestamp", -1), ("_id", -1)])
+        if before is None:
+            transactions_cursor = transactions_cursor.skip((page - 1) * page_size)
+        transactions = list(transactions_cursor.limit(page_size))
         
-        return transactions, 200
+        next_cursor = _encode_history_cursor(transactions[-1]) if len(transactions) == page_size else None
+        return {"items": [format_transaction(t) for t in transactions], "next_cursor": next_cursor}, 200
 
 # Block/Close Resources
 class BlockAccountResource(Resource):
     """PUT /accounts/block/<id>"""
     def put(self, id):
-        db = get_mongo_db()
-        
         # Atomically update only if status is Active
         result = db.accounts.find_one_and_update(
             {"id": id, "status": "Active"},
             {"$set": {"status": "Blocked"}},
+            projection=ACCOUNT_PROJECTION,
             return_document=True
         )
         
         if result:
-            return format_account(result), 200
+            return result, 200
         
         # Check if it's not found or already blocked/closed
         account_check = db.accounts.find_one({"id": id})
@@ -408,39 +807,43 @@ class BlockAccountResource(Resource):
 class CloseAccountResource(Resource):
     """PUT /accounts/close/<id>"""
     def put(self, id):
-        db = get_mongo_db()
-        
         account = db.accounts.find_one({"id": id})
         if not account:
             return {"message": f"Account with id {id} not found"}, 404
         
         # Business Requirement: Balance must be zero to close
-        # Use .get with a default value of 0.0 to prevent KeyError if balance is somehow missing
-        if account.get("balance", 0.0) != 0.0:
+        # Use .get with a default value of 0 to prevent KeyError if balance is somehow missing
+        if account.get("balance_cents", 0) != 0:
             return {"message": "Account must have a zero balance before closing.", 
-                    "current_balance": account["balance"]}, 400
+                    "current_balance": from_cents(account["balance_cents"])}, 400
         
         # Atomically set the status to Closed
         result = db.accounts.find_one_and_update(
             {"id": id, "status": {"$ne": "Closed"}}, # Only close if not already closed
             {"$set": {"status": "Closed"}},
+            projection=ACCOUNT_PROJECTION,
             return_document=True
         )
 
         if result:
-            return format_account(result), 200
+            return result, 200
         
         # If update failed, it means the account was already Closed
         return {"message": f"Account with id {id} is already Closed"}, 200 
 
+# Simple Annual Interest Rate (5% per year)
+ANNUAL_RATE_PERCENT = 5
+
+@lru_cache(maxsize=4096)
+def _interest_cents(balance_cents, months):
+    """Simple interest in whole cents for a balance held over a number of months (memoized)."""
+    return balance_cents * months * ANNUAL_RATE_PERCENT // 1200
+
 # NEW: Resource to calculate monthly interest
 class MonthlyInterestResource(Resource):
-    # Simple Annual Interest Rate (5% per year)
-    ANNUAL_RATE = 0.05
+    ANNUAL_RATE = ANNUAL_RATE_PERCENT / 100
     
     def get(self, id):
-        db = get_mongo_db()
-        
         try:
             account_id = int(id)
         except ValueError:
@@ -458,42 +861,170 @@ class MonthlyInterestResource(Resource):
         if account.get("status") != "Active":
             return {'message': f"Cannot calculate interest for closed or inactive account status: {account['status']}"}, 400
         
-        balance = account.get("balance", 0.0)
+        balance_cents = account.get("balance_cents", 0)
         no_of_months = account.get("no_of_months", 0)
         
         # Check no_of_months (Test: test_calculate_monthly_interest_no_months_configured)
         if no_of_months <= 0:
             return {'message': 'Account is not configured for monthly interest calculation (no_of_months is zero or negative).',
-                    'current_balance': round(balance, 2),
+                    'current_balance': from_cents(balance_cents),
                     'no_of_months': no_of_months}, 400
 
         # Calculation (Simple Interest formula for the time period)
         # Monthly Rate = Annual Rate / 12
         monthly_rate = self.ANNUAL_RATE / 12.0
         
-        # Total Interest = Principal * (Monthly Rate * Number of Months)
-        total_interest = balance * (monthly_rate * no_of_months)
-        
-        # Format for consistency (2 decimal places)
-        total_interest = round(total_interest, 2)
+        # Total Interest = Principal * (Monthly Rate * Number of Months), in integer cents
+        # so repeated requests for an unchanged balance hit the cache
+        total_interest = from_cents(_interest_cents(balance_cents, no_of_months))
         
         return {
             'account_id': account_id,
-            'current_balance': round(balance, 2),
+            'current_balance': from_cents(balance_cents),
             'no_of_months': no_of_months,
             'annual_interest_rate': f"{self.ANNUAL_RATE * 100}%",
             'monthly_interest_rate': round(monthly_rate * 100, 4), # Percentage
             'calculated_interest_amount': total_interest
         }, 200
 
+# Balance snapshots (run periodically, e.g. from cron)
+class BalanceSnapshotResource(Resource):
+    """POST /accounts/snapshots"""
+    def post(self):
+        now = datetime.now(UTC)
+        as_of = now - timedelta(seconds=SNAPSHOT_SETTLE_SECONDS)
+        # BSON dates keep milliseconds, so the as_of reported back is the one that is stored
+        as_of = as_of.replace(microsecond=as_of.microsecond // 1000 * 1000)
+        cutoff = now - timedelta(hours=SNAPSHOT_INTERVAL_HOURS)
+
+        # Latest snapshot time per account, so fresh accounts are skipped
+        latest = {
+            doc["_id"]: doc["as_of"]
+            for doc in db.balance_snapshots.aggregate([
+                {"$group": {"_id": "$account_id", "as_of": {"$max": "$as_of"}}}
+            ])
+        }
+
+        due = [
+            account["id"]
+            for account in db.accounts.find({}, {"_id": 0, "id": 1})
+            if account["id"] not in latest or latest[account["id"]] <= cutoff
+        ]
+
+        # The balance at as_of is the current balance minus every transaction logged after it,
+        # the same way statements without a snapshot derive their opening balance. (balance_after
+        # is not used: it follows the order of the $inc updates, which concurrent requests can
+        # log with timestamps in the opposite order.)
+        snapshots = list(db.accounts.aggregate([
+            {"$match": {"id": {"$in": due}}},
+            {"$lookup": {
+                "from": "transactions",
+                "localField": "id",
+                "foreignField": "account_id",
+                "pipeline": [
+                    {"$match": {"timestamp": {"$gt": as_of}}},
+                    {"$group": {"_id": None, "cents": {"$sum": {"$multiply": ["$amount_cents", _SIGN_EXPR]}}}}
+                ],
+                "as": "later"
+            }},
+            {"$project": {
+                "_id": 0,
+                "account_id": "$id",
+                "as_of": {"$literal": as_of},
+                "balance_cents": {"$subtract": ["$balance_cents", {"$ifNull": [{"$first": "$later.cents"}, 0]}]}
+            }}
+        ]))
+        if snapshots:
+            db.balance_snapshots.insert_many(snapshots)
+
+        return {'message': f'Created {len(snapshots)} balance snapshots', 'as_of': as_of.isoformat()}, 201
+
+# Static parts of the PDF statement layout
+STATEMENT_BANK_NAME = "Group 1 Bank"
+STATEMENT_TITLE = "Account Statement"
+# (label, width) for each transaction column
+STATEMENT_COLUMNS = (("Date/Time", 150), ("Type", 100), ("Amount ($)", 150), ("Running Balance ($)", 100))
+STATEMENT_TITLE_STYLE = ParagraphStyle("StatementTitle", fontName="Helvetica-Bold", fontSize=16, leading=28)
+STATEMENT_TEXT_STYLE = ParagraphStyle("StatementText", fontName="Helvetica", fontSize=10, leading=14)
+STATEMENT_TABLE_STYLE = TableStyle([
+    ("FONT", (0, 0), (-1, 0), "Helvetica-Bold", 10),
+    ("FONT", (0, 1), (-1, -1), "Helvetica", 9),
+    ("LINEBELOW", (0, 0), (-1, 0), 1, colors.black),
+    ("LEFTPADDING", (0, 0), (-1, -1), 0),
+    ("TOPPADDING", (0, 0), (-1, -1), 1),
+    ("BOTTOMPADDING", (0, 0), (-1, -1), 2)
+])
+# Fixed row heights (font leading plus padding), so the rows that fit on a page are known up front
+STATEMENT_HEADER_HEIGHT = 15
+STATEMENT_ROW_HEIGHT = 14
+
+def _statement_table(rows):
+    """A transactions table for one page: the column header followed by the given rows."""
+    return Table(
+        [[label for label, _ in STATEMENT_COLUMNS], *rows],
+        colWidths=[width for _, width in STATEMENT_COLUMNS],
+        rowHeights=[STATEMENT_HEADER_HEIGHT] + [STATEMENT_ROW_HEIGHT] * len(rows),
+        hAlign="LEFT",
+        style=STATEMENT_TABLE_STYLE
+    )
+
+def _render_statement_pdf(account, opening_balance, transactions):
+    """
+    Renders a PDF statement and returns it in a buffer positioned at the start.
+    Each page gets its own table sized to fit it, with its own header row, so
+    Platypus never splits a table; splitting one long table re-lays out the
+    remaining rows on every page, which makes rendering quadratic in length.
+    """
+    buffer = BytesIO()
+    doc = SimpleDocTemplate(buffer, pagesize=letter, leftMargin=50, rightMargin=50, topMargin=36, bottomMargin=50)
+
+    story = [
+        Paragraph(STATEMENT_BANK_NAME, STATEMENT_TITLE_STYLE),
+        Paragraph(STATEMENT_TITLE, STATEMENT_TITLE_STYLE),
+        Paragraph(escape(f"Account Holder: {account['name']} (ID: {account['id']})"), STATEMENT_TEXT_STYLE),
+        Paragraph(f"Statement Date: {datetime.now(UTC).strftime('%Y-%m-%d %H:%M:%S UTC')}", STATEMENT_TEXT_STYLE),
+        Paragraph(f"Opening Balance: ${opening_balance:.2f}", STATEMENT_TEXT_STYLE),
+        Paragraph(f"Closing Balance: ${account['balance']:.2f}", STATEMENT_TEXT_STYLE),
+        Spacer(1, 14)
+    ]
+
+    # Usable frame height (the frame pads 6pt top and bottom); the first page also holds the title block
+    page_height = doc.height - 12
+    first_page_height = page_height - sum(f.wrap(doc.width, page_height)[1] for f in story)
+    rows_per_page = int((page_height - STATEMENT_HEADER_HEIGHT) // STATEMENT_ROW_HEIGHT)
+    rows_on_first_page = int((first_page_height - STATEMENT_HEADER_HEIGHT) // STATEMENT_ROW_HEIGHT)
+
+    rows = (
+        [
+            t['timestamp'],
+            t['type'].capitalize(),
+            f"{'' if _SIGN[t['type']] > 0 else '-'}{t['amount']:.2f}",
+            f"{t['running_balance']:.2f}"
+        ]
+        for t in transactions
+    )
+    page_rows = list(itertools.islice(rows, rows_on_first_page))
+    story.append(_statement_table(page_rows))
+    while page_rows := list(itertools.islice(rows, rows_per_page)):
+        story.extend([PageBreak(), _statement_table(page_rows)])
+
+    doc.build(story)
+    buffer.seek(0)
+    return buffer
+
 class AccountStatementJsonResource(Resource):
     def get(self, id):
-        data, status = _get_statement_data(id)
+        try:
+            start = _parse_statement_start()
+        except ValueError:
+            return {'message': 'Invalid start format, expected an ISO 8601 timestamp'}, 400
+
+        data, status = _get_statement_data(id, start)
         if status != 200:
             return data, status
 
         account_data = data["account"]
-        transactions = data["transactions"]
+        transactions = list(data["transactions"])
         opening_balance = data["opening_balance"]
         
         statement = {
@@ -508,87 +1039,29 @@ class AccountStatementJsonResource(Resource):
     
 class AccountStatementPdfResource(Resource):
     def get(self, id):
-        data, status = _get_statement_data(id)
+        try:
+            start = _parse_statement_start()
+        except ValueError:
+            return {'message': 'Invalid start format, expected an ISO 8601 timestamp'}, 400
+
+        # Serve a previously rendered PDF if nothing on the statement has changed since
+        cache_key = _statement_cache_key(id, start)
+        if cache_key is None:
+            return {"message": f"Account with id {id} not found"}, 404
+        cached = statement_cache.find_one({"filename": cache_key})
+        if cached:
+            return _send_statement_pdf(cached, id)
+
+        data, status = _get_statement_data(id, start)
         if status != 200:
             return data, status
         
-        account = data["account"]
-        transactions = data["transactions"]
-        
-        # --- Start ReportLab PDF Generation ---
-        
-        buffer = BytesIO()
-        c = canvas.Canvas(buffer, pagesize=letter)
-        
-        # Define coordinates and step for drawing
-        X_START = 50
-        Y_START = 750
-        Y_STEP = 14
-        
-        # Title and Summary
-        c.setFont("Helvetica-Bold", 16)
-        c.drawString(X_START, Y_START, "Group 1 Bank")
-
-        c.setFont("Helvetica-Bold", 16)
-        c.drawString(X_START, Y_START - Y_STEP * 2, "Account Statement")
-        
-        c.setFont("Helvetica", 10)
-        c.drawString(X_START, Y_START - Y_STEP * 3, f"Account Holder: {account['name']} (ID: {account['id']})")
-        c.drawString(X_START, Y_START - Y_STEP * 4, f"Statement Date: {datetime.now(UTC).strftime('%Y-%m-%d %H:%M:%S UTC')}")
-        c.drawString(X_START, Y_START - Y_STEP * 5, f"Opening Balance: ${data['opening_balance']:.2f}")
-        c.drawString(X_START, Y_START - Y_STEP * 6, f"Closing Balance: ${account['balance']:.2f}")
-
-        # Transactions Header
-        Y_HEADER = Y_START - Y_STEP * 8
-        c.setFont("Helvetica-Bold", 10)
-        c.drawString(X_START, Y_HEADER, "Date/Time")
-        c.drawString(X_START + 150, Y_HEADER, "Type")
-        c.drawString(X_START + 250, Y_HEADER, "Amount ($)")
-        c.drawString(X_START + 400, Y_HEADER, "Running Balance ($)")
-        
-        # Draw Separator Line
-        c.line(X_START, Y_HEADER - 2, X_START + 500, Y_HEADER - 2)
-
-        # Transactions Data
-        y_position = Y_HEADER - Y_STEP * 2
-        c.setFont("Helvetica", 9)
-        
-        for t in transactions:
-            # Check for page break
-            if y_position < 50:
-                c.showPage()
-                y_position = 750
-                # Redraw header on new page
-                c.setFont("Helvetica-Bold", 10)
-                c.drawString(X_START, y_position, "Date/Time")
-                c.drawString(X_START + 150, y_position, "Type")
-                c.drawString(X_START + 250, y_position, "Amount ($)")
-                c.drawString(X_START + 400, y_position, "Running Balance ($)")
-                c.line(X_START, y_position - 2, X_START + 500, y_position - 2)
-                y_position -= Y_STEP * 2
-                c.setFont("Helvetica", 9)
-
-            amount_sign = "" if t['type'] == 'deposit' else "-"
-            
-            c.drawString(X_START, y_position, t['timestamp'])
-            c.drawString(X_START + 150, y_position, t['type'].capitalize())
-            c.drawString(X_START + 250, y_position, f"{amount_sign}{t['amount']:.2f}")
-            c.drawString(X_START + 400, y_position, f"{t['running_balance']:.2f}")
-            
-            y_position -= Y_STEP
+        buffer = _render_statement_pdf(data["account"], data["opening_balance"], data["transactions"])
 
-        c.save()
+        # Replace this account's older cached statements with the new one
+        for old in statement_cache.find({"account_id": id}):
+            statement_cache.delete(old._id)
+        statement_cache.put(buffer.getvalue(), filename=cache_key, account_id=id)
 
-        buffer.seek(0)
-        pdf_content = buffer.getvalue()
-        
-        # --- End ReportLab PDF Generation ---
-
-        return Response(
-            pdf_content,
-            mimetype='application/pdf',
-            headers={
-                'Content-Disposition': f'attachment;filename=statement_{account["id"]}_{datetime.now(UTC).strftime("%Y%m%d")}.pdf',
-                'Content-Transfer-Encoding': 'binary'
-            }
-        )
\ No newline at end of file
+        # send_file streams the buffer to the client instead of copying it into a bytes object
+        return _send_statement_pdf(buffer, id)